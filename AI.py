@@ -8,9 +8,109 @@ No need to run CLI first - just run this file directly!
 
 import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
-from pyswip import Prolog
+from pyswip import Prolog, Functor, Variable, Query, call
 import os
-from typing import List, Dict, Optional
+import atexit
+import bisect
+import concurrent.futures
+import heapq
+import re
+import threading
+from collections import deque
+from typing import Callable, List, Dict, Optional, Tuple
+
+# Optional: only used to speed up pathfinding
+try:
+    import numpy as np
+except ImportError:
+    np = None
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+try:
+    from scipy.sparse.csgraph import csgraph_from_dense, floyd_warshall
+except ImportError:
+    floyd_warshall = None
+
+
+# Average speeds by road type (km/h), mirroring speed/2 in the knowledge base
+SPEEDS = {'paved': 60, 'unpaved': 30}
+
+# Integer codes for road types and statuses in the search structures;
+# names are only needed again for display. Unknown names map to -1.
+ROAD_TYPES = {'paved': 0, 'unpaved': 1}
+STATUSES = {'open': 0, 'closed': 1}
+PAVED = ROAD_TYPES['paved']
+OPEN = STATUSES['open']
+
+# Speeds keyed by road type code
+TYPE_SPEEDS = {ROAD_TYPES[name]: speed for name, speed in SPEEDS.items()}
+
+# Names accepted as Prolog atoms for locations, road types and conditions
+ATOM_NAME = re.compile(r'^[a-z][a-z0-9_]*$')
+
+# Networks with up to this many locations answer searches from a
+# precomputed all-pairs table
+APSP_THRESHOLD = 300
+
+# Networks with more locations than this use the compiled CSR search
+CSR_THRESHOLD = 1000
+
+# Rule lines for the text panes, newline included
+_EQ60 = "=" * 60 + "\n"
+_DASH60 = "-" * 60 + "\n"
+_EQ70 = "=" * 70 + "\n"
+_DASH70 = "-" * 70 + "\n"
+# The same rules with a blank line after, and the closing rule with one before
+_EQ60_GAP = _EQ60 + "\n"
+_EQ70_GAP = _EQ70 + "\n"
+_EQ70_END = "\n" + _EQ70
+
+# Icons shown next to each road in the network info; anything that isn't
+# open or paved falls back to the closed / unpaved icon
+_STATUS_ICON = {'open': "✓", 'closed': "✗"}
+_TYPE_ICON = {'paved': "🛣️", 'unpaved': "🏞️"}
+
+# Lines inserted per event-loop turn when streaming the network info
+INFO_BATCH = 200
+
+# Searches remembered by the GUI, oldest dropped first
+PATH_CACHE_SIZE = 256
+
+
+def _dijkstra_csr(indptr, indices, weights, src, dst):
+    """
+    Dijkstra over a CSR graph, compiled with Numba when it is installed.
+    
+    Edges that may not be used carry an infinite weight.
+    
+    Returns:
+        (cost to dst, predecessor array)
+    """
+    n = indptr.shape[0] - 1
+    dist = np.full(n, np.inf)
+    prev = np.full(n, -1, dtype=np.int64)
+    dist[src] = 0.0
+    heap = [(0.0, src)]
+    while len(heap) > 0:
+        cost, node = heapq.heappop(heap)
+        if node == dst:
+            break
+        if cost > dist[node]:
+            continue
+        for k in range(indptr[node], indptr[node + 1]):
+            new_cost = cost + weights[k]
+            nxt = indices[k]
+            if new_cost < dist[nxt]:
+                dist[nxt] = new_cost
+                prev[nxt] = node
+                heapq.heappush(heap, (new_cost, nxt))
+    return dist[dst], prev
+
+
+if njit is not None:
+    _dijkstra_csr = njit(cache=True)(_dijkstra_csr)
 
 
 class JamaicaRoadNetwork:
@@ -28,16 +128,82 @@ class JamaicaRoadNetwork:
         """
         self.prolog = Prolog()
         self.prolog_file = prolog_file
+        # pyswip allows one open query at a time; hold this to query from threads
+        self.prolog_lock = threading.RLock()
+        # Guards the search caches and _version below. It is only held for
+        # quick reads and stores, never across a Prolog call or a search.
+        self._cache_lock = threading.Lock()
+        # Functors for the queries sent while the app runs, built once and
+        # reused; only one-off setup goals at load time are parsed strings
+        self._road = Functor('road', 5)
+        self._road_condition = Functor('road_condition', 3)
+        self._canon = Functor('canon', 4)
+        self._clause = Functor('clause', 2)
+        self._findall = Functor('findall', 3)
+        self._and = Functor(',', 2)
+        self._assertz = Functor('assertz', 1)
+        self._retract = Functor('retract', 1)
+        # Results of find_path keyed by (start, end, criteria)
+        self._path_cache: Dict[tuple, Dict] = {}
+        # Adjacency list built from road/5 facts on first search
+        self._adj: Optional[Dict[str, List[Tuple[str, float, int, int]]]] = None
+        self._conditions: Optional[Dict[Tuple[str, str], set]] = None
+        # (location -> row, CSR arrays) for the array-based searches
+        self._csr: Optional[tuple] = None
+        # (weight, avoid) -> (distance matrix, predecessor matrix)
+        self._apsp: Dict[tuple, tuple] = {}
+        self._locations_sorted: Optional[List[str]] = None
+        # Bumped on every change so callers can tell when cached views are stale
+        self._version = 0
+        # New facts are buffered and written to the file in batches
+        self._pending_writes: List[str] = []
+        self._flush_threshold = 32
+        atexit.register(self._flush_writes)
         self.load_prolog_file()
         
     def load_prolog_file(self):
         """Load the Prolog knowledge base."""
         if os.path.exists(self.prolog_file):
-            self.prolog.consult(self.prolog_file)
+            self._consult_compiled()
             print(f"✓ Loaded Prolog knowledge base: {self.prolog_file}")
         else:
             print(f"⚠ Warning: {self.prolog_file} not found. Creating new file...")
             self.create_default_network()
+        self._define_helpers()
+    
+    def _define_helpers(self):
+        """
+        Assert helper predicates the Python side relies on.
+        
+        These are kept out of the knowledge base file so that files
+        written by older versions work unchanged.
+        """
+        # canon(A, B, X, Y): X-Y is the alphabetically ordered pair of A and B
+        for goal in ("retractall(canon(_, _, _, _))",
+                     "assertz((canon(A, B, A, B) :- A @=< B, !))",
+                     "assertz(canon(A, B, B, A))"):
+            list(self.prolog.query(goal))
+    
+    def _consult_compiled(self):
+        """
+        Load the knowledge base from its quick-load (.qlf) file.
+        
+        The .qlf is rebuilt with qcompile/1 whenever it is missing or older
+        than the .pl source, e.g. after roads were appended to the file.
+        """
+        qlf_file = os.path.splitext(self.prolog_file)[0] + ".qlf"
+        try:
+            if (not os.path.exists(qlf_file) or
+                    os.path.getmtime(qlf_file) < os.path.getmtime(self.prolog_file)):
+                # qcompile/1 loads the source as well as writing the .qlf
+                source = self.prolog_file.replace("\\", "/")
+                list(self.prolog.query(f"qcompile('{source}')"))
+            else:
+                self.prolog.consult(qlf_file)
+        except Exception as e:
+            # Unwritable directory or a .qlf from another SWI-Prolog version
+            print(f"⚠ Could not use {qlf_file} ({e}), loading source instead")
+            self.prolog.consult(self.prolog_file)
     
     def create_default_network(self):
         """Create a default Jamaican road network with sample data."""
@@ -45,6 +211,10 @@ class JamaicaRoadNetwork:
 % Jamaican Rural Road Network Knowledge Base
 % Facts: road(Source, Destination, Distance_Km, Type, Status)
 
+:- dynamic road/5.
+:- dynamic road_condition/3.
+:- use_module(library(heaps)).
+
 % Sample Jamaican rural network
 road(morant_bay, port_morant, 12, paved, open).
 road(port_morant, golden_grove, 8, unpaved, open).
@@ -65,9 +235,11 @@ road_condition(port_morant, golden_grove, deep_potholes).
 road_condition(morant_bay, yallahs, broken_cisterns).
 road_condition(bath, stony_gut, deep_potholes).
 
-% Bidirectional roads (symmetric)
-road(B, A, Dist, Type, Status) :- road(A, B, Dist, Type, Status).
-road_condition(B, A, Condition) :- road_condition(A, B, Condition).
+% Roads are stored once and travelled in either direction
+connected(A, B, Dist, Type, Status) :- road(A, B, Dist, Type, Status).
+connected(A, B, Dist, Type, Status) :- road(B, A, Dist, Type, Status).
+has_condition(A, B, Condition) :- road_condition(A, B, Condition).
+has_condition(A, B, Condition) :- road_condition(B, A, Condition).
 
 % Average speeds by road type (km/h)
 speed(paved, 60).
@@ -75,76 +247,77 @@ speed(unpaved, 30).
 
 % Travel time calculation
 travel_time(Source, Dest, Time) :-
-    road(Source, Dest, Distance, Type, open),
+    connected(Source, Dest, Distance, Type, open),
     speed(Type, Speed),
     Time is Distance / Speed * 60.
 
 % Helper: Check if road exists
-road_exists(A, B) :- road(A, B, _, _, _).
+road_exists(A, B) :- connected(A, B, _, _, _).
 
 % Helper: Get all locations
 location(L) :- road(L, _, _, _, _).
 location(L) :- road(_, L, _, _, _).
 
 % Dijkstra's Algorithm Implementation
+% The frontier is a library(heaps) priority queue keyed on path cost.
+% Entries are p(Visited, Path, Hole): Visited is [Node|...] newest first
+% for the membership check, and Path-Hole is the same route in forward
+% order as a difference list, so a finished path needs no reverse/2.
 shortest_path(Start, End, Path, TotalDistance) :-
-    dijkstra([[Start]], End, Path, TotalDistance).
+    singleton_heap(Heap, 0, p([Start], [Start|Hole], Hole)),
+    dijkstra(Heap, End, Path, TotalDistance).
 
-dijkstra([[End|Path]|_], End, FinalPath, Distance) :-
-    reverse([End|Path], FinalPath),
-    calculate_distance(FinalPath, Distance).
+dijkstra(Heap, End, FinalPath, Distance) :-
+    get_from_heap(Heap, Cost, p([Node|Visited], Path, Hole), RestHeap),
+    (   Node == End,
+        Distance = Cost,
+        Hole = [],
+        FinalPath = Path
+    ;   findall(NewCost-p([Next, Node|Visited], Path, NewHole),
+                (connected(Node, Next, Dist, _, open),
+                 \\+ member(Next, [Node|Visited]),
+                 NewCost is Cost + Dist,
+                 Hole = [Next|NewHole]),
+                Extensions),
+        foldl(push_path, Extensions, RestHeap, NewHeap),
+        dijkstra(NewHeap, End, FinalPath, Distance)
+    ).
 
-dijkstra([Current|Queue], End, Path, Distance) :-
-    Current = [Node|_],
-    findall([Next, Node|Current],
-            (road(Node, Next, _, _, open),
-             \\+ member(Next, Current)),
-            Extensions),
-    append(Queue, Extensions, NewQueue),
-    sort_paths(NewQueue, SortedQueue),
-    dijkstra(SortedQueue, End, Path, Distance).
+push_path(Cost-Path, Heap0, Heap) :-
+    add_to_heap(Heap0, Cost, Path, Heap).
 
 calculate_distance([_], 0).
 calculate_distance([A, B|Rest], Total) :-
-    road(A, B, Dist, _, _),
+    connected(A, B, Dist, _, _),
     calculate_distance([B|Rest], RestDist),
     Total is Dist + RestDist.
 
-sort_paths(Paths, Sorted) :-
-    map_list_to_pairs(path_cost, Paths, Paired),
-    keysort(Paired, SortedPairs),
-    pairs_values(SortedPairs, Sorted).
-
-path_cost([H|T], Cost) :-
-    reverse([H|T], Path),
-    calculate_distance(Path, Cost).
-
 % BFS Implementation
 bfs_path(Start, End, Path) :-
-    bfs_search([[Start]], End, Path).
+    bfs_search([p([Start], [Start|Hole], Hole)], End, Path).
 
-bfs_search([[End|Path]|_], End, FinalPath) :-
-    reverse([End|Path], FinalPath).
+bfs_search([p([End|_], Path, [])|_], End, Path).
 
-bfs_search([[Node|Path]|Queue], End, FinalPath) :-
-    findall([Next, Node|Path],
-            (road(Node, Next, _, _, open),
-             \\+ member(Next, [Node|Path])),
+bfs_search([p([Node|Visited], Path, Hole)|Queue], End, FinalPath) :-
+    findall(p([Next, Node|Visited], Path, NewHole),
+            (connected(Node, Next, _, _, open),
+             \\+ member(Next, [Node|Visited]),
+             Hole = [Next|NewHole]),
             Extensions),
     append(Queue, Extensions, NewQueue),
     bfs_search(NewQueue, End, FinalPath).
 
 % DFS Implementation
-dfs_path(Start, End, Path) :-
+% The path is built front to back in the last argument.
+dfs_path(Start, End, [Start|Path]) :-
     dfs_search([Start], End, Path).
 
-dfs_search([End|Path], End, FinalPath) :-
-    reverse([End|Path], FinalPath).
+dfs_search([End|_], End, []).
 
-dfs_search([Node|Path], End, FinalPath) :-
-    road(Node, Next, _, _, open),
-    \\+ member(Next, [Node|Path]),
-    dfs_search([Next, Node|Path], End, FinalPath).
+dfs_search([Node|Visited], End, [Next|Path]) :-
+    connected(Node, Next, _, _, open),
+    \\+ member(Next, [Node|Visited]),
+    dfs_search([Next, Node|Visited], End, Path).
 
 % Fastest route (considering road type speeds)
 fastest_path(Start, End, Path, TotalTime) :-
@@ -166,86 +339,193 @@ dijkstra_time([[Node, CurrentTime]|Queue], End, [Node|RestPath], TotalTime) :-
 
 % Path avoiding unpaved roads
 paved_path(Start, End, Path, Distance) :-
-    paved_dijkstra([[Start]], End, Path, Distance).
-
-paved_dijkstra([[End|Path]|_], End, FinalPath, Distance) :-
-    reverse([End|Path], FinalPath),
-    calculate_distance(FinalPath, Distance).
+    singleton_heap(Heap, 0, p([Start], [Start|Hole], Hole)),
+    paved_dijkstra(Heap, End, Path, Distance).
 
-paved_dijkstra([Current|Queue], End, Path, Distance) :-
-    Current = [Node|_],
-    findall([Next, Node|Current],
-            (road(Node, Next, _, paved, open),
-             \\+ member(Next, Current)),
-            Extensions),
-    append(Queue, Extensions, NewQueue),
-    sort_paths(NewQueue, SortedQueue),
-    paved_dijkstra(SortedQueue, End, Path, Distance).
+paved_dijkstra(Heap, End, FinalPath, Distance) :-
+    get_from_heap(Heap, Cost, p([Node|Visited], Path, Hole), RestHeap),
+    (   Node == End,
+        Distance = Cost,
+        Hole = [],
+        FinalPath = Path
+    ;   findall(NewCost-p([Next, Node|Visited], Path, NewHole),
+                (connected(Node, Next, Dist, paved, open),
+                 \\+ member(Next, [Node|Visited]),
+                 NewCost is Cost + Dist,
+                 Hole = [Next|NewHole]),
+                Extensions),
+        foldl(push_path, Extensions, RestHeap, NewHeap),
+        paved_dijkstra(NewHeap, End, FinalPath, Distance)
+    ).
 
 % Path avoiding specific conditions
 safe_path(Start, End, AvoidCondition, Path, Distance) :-
-    safe_dijkstra([[Start]], End, AvoidCondition, Path, Distance).
-
-safe_dijkstra([[End|Path]|_], End, _, FinalPath, Distance) :-
-    reverse([End|Path], FinalPath),
-    calculate_distance(FinalPath, Distance).
+    singleton_heap(Heap, 0, p([Start], [Start|Hole], Hole)),
+    safe_dijkstra(Heap, End, AvoidCondition, Path, Distance).
 
-safe_dijkstra([Current|Queue], End, AvoidCondition, Path, Distance) :-
-    Current = [Node|_],
-    findall([Next, Node|Current],
-            (road(Node, Next, _, _, open),
-             \\+ road_condition(Node, Next, AvoidCondition),
-             \\+ member(Next, Current)),
-            Extensions),
-    append(Queue, Extensions, NewQueue),
-    sort_paths(NewQueue, SortedQueue),
-    safe_dijkstra(SortedQueue, End, AvoidCondition, Path, Distance).
+safe_dijkstra(Heap, End, AvoidCondition, FinalPath, Distance) :-
+    get_from_heap(Heap, Cost, p([Node|Visited], Path, Hole), RestHeap),
+    (   Node == End,
+        Distance = Cost,
+        Hole = [],
+        FinalPath = Path
+    ;   findall(NewCost-p([Next, Node|Visited], Path, NewHole),
+                (connected(Node, Next, Dist, _, open),
+                 \\+ has_condition(Node, Next, AvoidCondition),
+                 \\+ member(Next, [Node|Visited]),
+                 NewCost is Cost + Dist,
+                 Hole = [Next|NewHole]),
+                Extensions),
+        foldl(push_path, Extensions, RestHeap, NewHeap),
+        safe_dijkstra(NewHeap, End, AvoidCondition, FinalPath, Distance)
+    ).
 """
         with open(self.prolog_file, 'w') as f:
             f.write(default_data)
         self.prolog.consult(self.prolog_file)
         print("✓ Created default network with sample Jamaican locations")
     
-    def get_all_locations(self) -> List[str]:
-        """Retrieve all unique locations from the network."""
+    def get_all_locations(self) -> Optional[List[str]]:
+        """
+        Retrieve all unique locations from the network.
+        
+        Returns:
+            A fresh sorted list of location names, or None if the roads
+            could not be read
+        """
+        with self._cache_lock:
+            if self._locations_sorted is not None:
+                return list(self._locations_sorted)
+            version = self._version
+        
         locations = set()
         try:
-            # Query all locations with timeout protection
-            query = "location(L)"
-            for solution in self.prolog.query(query):
-                if 'L' in solution:
-                    # Convert to string if it's an atom
-                    loc = str(solution['L'])
-                    locations.add(loc)
+            # One findall brings every endpoint pair across in a single solution
+            A, B, L = Variable(), Variable(), Variable()
+            result = self._first_solution(self._findall(
+                [A, B], self._clause(self._road(A, B, Variable(), Variable(), Variable()),
+                                     'true'), L), L)
+            if result is None:
+                raise RuntimeError("could not read road/5 facts")
+            for a, b in result[0]:
+                locations.add(str(a))
+                locations.add(str(b))
         except KeyboardInterrupt:
             print("Query interrupted by user")
             raise
         except Exception as e:
             print(f"Error retrieving locations: {e}")
-            # Try alternative method if location/1 fails
+            return None
+        
+        # A road added since the query started bumps the version, so the list
+        # isn't cached and the next call reads the new endpoints. Callers get
+        # their own copy since _add_locations updates the cached one in place
+        locations = sorted(locations)
+        self._cache_if_current(version, _locations_sorted=locations)
+        return list(locations)
+    
+    def get_road_listing(self) -> list:
+        """
+        Retrieve every road/5 fact for display in a single query.
+        
+        Returns:
+            List of [source, dest, x, y, distance, type, status] rows, where
+            x, y is source and dest in canonical order from canon/4
+        """
+        A, B, X, Y, D, T, S, L = (Variable() for _ in range(8))
+        result = self._first_solution(self._findall(
+            [A, B, X, Y, D, T, S],
+            self._and(self._clause(self._road(A, B, D, T, S), 'true'),
+                      self._canon(A, B, X, Y)), L), L)
+        if result is None:
+            raise RuntimeError("could not read road/5 facts")
+        return result[0]
+    
+    def _add_locations(self, *names: str):
+        """Insert new road endpoints into the cached location list."""
+        with self._cache_lock:
+            if self._locations_sorted is None:
+                return
+            for name in names:
+                i = bisect.bisect_left(self._locations_sorted, name)
+                if i == len(self._locations_sorted) or self._locations_sorted[i] != name:
+                    self._locations_sorted.insert(i, name)
+    
+    @staticmethod
+    def _atom(name: str) -> str:
+        """
+        Check that name is a plain Prolog atom.
+        
+        pyswip turns a str argument of a term into an atom, so a validated
+        name can be passed to Functor directly without quoting.
+        """
+        if not ATOM_NAME.match(name):
+            raise ValueError(f"invalid name {name!r}: use lowercase letters, digits and underscores")
+        return name
+    
+    @staticmethod
+    def _number(value: float):
+        """Wrap a number for a term; pyswip only puts integers directly."""
+        if isinstance(value, int):
+            return value
+        var = Variable()
+        var.value = float(value)
+        return var
+    
+    def attach_thread(self):
+        """Give the calling thread a Prolog engine before it runs prepared queries."""
+        # Prolog.query attaches an engine to a new thread; Query and call
+        # don't. Hold the lock so another thread's open query can't make
+        # this one fail with NestedQueryError.
+        with self.prolog_lock:
+            list(self.prolog.query("true"))
+    
+    def _first_solution(self, goal, *variables) -> Optional[tuple]:
+        """
+        Run a prepared goal and read the bindings of its first solution.
+        
+        Args:
+            goal: Term built from one of the cached functors
+            variables: Variables inside goal whose values are wanted
+            
+        Returns:
+            Tuple of the variables' values, or None if the goal fails
+        """
+        with self.prolog_lock:
+            query = Query(goal)
             try:
-                print("Trying alternative method to get locations...")
-                for solution in self.prolog.query("road(A, _, _, _, _)"):
-                    if 'A' in solution:
-                        locations.add(str(solution['A']))
-                for solution in self.prolog.query("road(_, B, _, _, _)"):
-                    if 'B' in solution:
-                        locations.add(str(solution['B']))
-            except Exception as e2:
-                print(f"Alternative method also failed: {e2}")
-        
-        return sorted(list(locations))
+                if not query.nextSolution():
+                    return None
+                return tuple(var.value for var in variables)
+            finally:
+                query.closeQuery()
+    
+    @staticmethod
+    def _call(goal, action: str):
+        """
+        Run a prepared goal once and raise if Prolog rejects it.
+        
+        pyswip's call() reports failure, including a caught Prolog error
+        such as a permission error on a static predicate, only through
+        its return value.
+        """
+        if not call(goal):
+            raise RuntimeError(f"Prolog could not {action}")
     
     def add_road(self, source: str, dest: str, distance: float, 
                  road_type: str, status: str) -> bool:
         """Add a new road to the network."""
         try:
-            query = f"assertz(road({source}, {dest}, {distance}, {road_type}, {status}))"
-            list(self.prolog.query(query))
+            with self.prolog_lock:
+                self._call(self._assertz(self._road(
+                    self._atom(source), self._atom(dest), self._number(distance),
+                    self._atom(road_type), self._atom(status))), "assert the road")
             
             self._append_to_file(
                 f"road({source}, {dest}, {distance}, {road_type}, {status}).\n"
             )
+            self._invalidate_caches()
+            self._add_locations(source, dest)
             print(f"✓ Added road: {source} → {dest} ({distance}km, {road_type}, {status})")
             return True
         except Exception as e:
@@ -255,22 +535,28 @@ safe_dijkstra([Current|Queue], End, AvoidCondition, Path, Distance) :-
     def update_road_status(self, source: str, dest: str, new_status: str) -> bool:
         """Update the status of an existing road."""
         try:
-            query = f"road({source}, {dest}, D, T, _)"
-            results = list(self.prolog.query(query))
-            
-            if not results:
-                print(f"✗ Road not found: {source} → {dest}")
-                return False
-            
-            distance = results[0]['D']
-            road_type = results[0]['T']
-            
-            retract_query = f"retract(road({source}, {dest}, {distance}, {road_type}, _))"
-            list(self.prolog.query(retract_query))
-            
-            assert_query = f"assertz(road({source}, {dest}, {distance}, {road_type}, {new_status}))"
-            list(self.prolog.query(assert_query))
+            source, dest = self._atom(source), self._atom(dest)
+            new_status = self._atom(new_status)
+            # Only the first matching road is updated, so stop after one solution
+            D, T = Variable(), Variable()
+            with self.prolog_lock:
+                result = self._first_solution(
+                    self._road(source, dest, D, T, Variable()), D, T)
+                
+                if result is None:
+                    print(f"✗ Road not found: {source} → {dest}")
+                    return False
+                
+                distance, road_type = result[0], str(result[1])
+                
+                self._call(self._retract(self._road(
+                    source, dest, self._number(distance), road_type, Variable())),
+                    "retract the old road")
+                self._call(self._assertz(self._road(
+                    source, dest, self._number(distance), road_type, new_status)),
+                    "assert the updated road")
             
+            self._invalidate_caches()
             print(f"✓ Updated road status: {source} → {dest} is now {new_status}")
             return True
         except Exception as e:
@@ -280,12 +566,15 @@ safe_dijkstra([Current|Queue], End, AvoidCondition, Path, Distance) :-
     def add_road_condition(self, source: str, dest: str, condition: str) -> bool:
         """Add a road condition."""
         try:
-            query = f"assertz(road_condition({source}, {dest}, {condition}))"
-            list(self.prolog.query(query))
+            with self.prolog_lock:
+                self._call(self._assertz(self._road_condition(
+                    self._atom(source), self._atom(dest), self._atom(condition))),
+                    "assert the condition")
             
             self._append_to_file(
                 f"road_condition({source}, {dest}, {condition}).\n"
             )
+            self._invalidate_caches()
             print(f"✓ Added condition: {source} → {dest} has {condition}")
             return True
         except Exception as e:
@@ -294,102 +583,80 @@ safe_dijkstra([Current|Queue], End, AvoidCondition, Path, Distance) :-
     
     def find_path(self, start: str, end: str, criteria: str) -> Optional[Dict]:
         """Find a path between two locations based on specified criteria."""
+        key = (start, end, criteria)
+        result = self._path_cache.get(key)
+        if result is not None:
+            return result
+        
+        # No lock is held while searching, so an edit can land mid-search.
+        # A result is only kept, and only trusted, if the network version
+        # is the same before and after; otherwise search the new data.
+        for _ in range(3):
+            version = self._version
+            result = self._find_path_uncached(start, end, criteria)
+            with self._cache_lock:
+                if self._version == version:
+                    if result is not None:
+                        self._path_cache[key] = result
+                    return result
+        return result
+    
+    def _find_path_uncached(self, start: str, end: str, criteria: str) -> Optional[Dict]:
+        """Search the cached road graph for a path without consulting the cache."""
         try:
             print(f"\n=== Finding path: {start} -> {end} (criteria: {criteria}) ===")
             
             if criteria == "shortest":
-                query = f"shortest_path({start}, {end}, Path, Distance)"
-                print(f"Query: {query}")
-                results = list(self.prolog.query(query))
-                print(f"Found {len(results)} paths")
-                
-                if results:
-                    # Get the path with minimum distance
-                    result = min(results, key=lambda x: x['Distance'])
-                    path = result['Path']
-                    distance = result['Distance']
-                    time = self._calculate_time(path)
-                    
+                found = self._bidir_dijkstra(start, end, 'distance')
+                if found:
+                    path, distance = found
                     return {
                         'path': path,
                         'distance': distance,
-                        'time': time,
+                        'time': self._path_totals(path, 'distance')[1],
                         'criteria': 'Shortest Distance'
                     }
             
             elif criteria == "fastest":
-                query = f"fastest_path({start}, {end}, Path, Time)"
-                print(f"Query: {query}")
-                results = list(self.prolog.query(query))
-                print(f"Found {len(results)} paths")
-                
-                if results:
-                    # Get the path with minimum time
-                    result = min(results, key=lambda x: x['Time'])
-                    path = result['Path']
-                    time = result['Time']
-                    distance = self._calculate_distance(path)
-                    
+                found = self._dijkstra(start, end, 'time')
+                if found:
+                    path, time = found
                     return {
                         'path': path,
-                        'distance': distance,
+                        'distance': self._path_totals(path, 'time')[0],
                         'time': time,
                         'criteria': 'Fastest Route'
                     }
             
             elif criteria == "paved":
-                query = f"paved_path({start}, {end}, Path, Distance)"
-                print(f"Query: {query}")
-                results = list(self.prolog.query(query))
-                print(f"Found {len(results)} paths")
-                
-                if results:
-                    # Get the path with minimum distance
-                    result = min(results, key=lambda x: x['Distance'])
-                    path = result['Path']
-                    distance = result['Distance']
-                    time = self._calculate_time(path)
-                    
+                found = self._bidir_dijkstra(start, end, 'paved')
+                if found:
+                    path, distance = found
                     return {
                         'path': path,
                         'distance': distance,
-                        'time': time,
+                        'time': self._path_totals(path, 'paved')[1],
                         'criteria': 'Paved Roads Only'
                     }
             
             elif criteria in ["no_potholes", "no_cisterns"]:
                 condition = "deep_potholes" if criteria == "no_potholes" else "broken_cisterns"
-                query = f"safe_path({start}, {end}, {condition}, Path, Distance)"
-                print(f"Query: {query}")
-                results = list(self.prolog.query(query))
-                print(f"Found {len(results)} paths")
-                
-                if results:
-                    # Get the path with minimum distance
-                    result = min(results, key=lambda x: x['Distance'])
-                    path = result['Path']
-                    distance = result['Distance']
-                    time = self._calculate_time(path)
-                    
+                found = self._bidir_dijkstra(start, end, 'distance', avoid=condition)
+                if found:
+                    path, distance = found
                     return {
                         'path': path,
                         'distance': distance,
-                        'time': time,
+                        'time': self._path_totals(path, 'distance', avoid=condition)[1],
                         'criteria': f'Avoiding {condition.replace("_", " ").title()}'
                     }
             
             elif criteria == "bfs":
-                query = f"bfs_path({start}, {end}, Path)"
-                print(f"Query: {query}")
-                results = list(self.prolog.query(query))
-                print(f"Found {len(results)} paths")
-                
-                if results:
-                    # BFS returns paths in order, take the first one (shortest hops)
-                    path = results[0]['Path']
-                    distance = self._calculate_distance(path)
-                    time = self._calculate_time(path)
-                    
+                # Fewest segments over open roads
+                path = self._bfs(start, end)
+                if path:
+                    # Each hop counts the shortest open road between its ends
+                    distance, time = self._path_totals(path, 'distance')
                     return {
                         'path': path,
                         'distance': distance,
@@ -397,7 +664,7 @@ safe_dijkstra([Current|Queue], End, AvoidCondition, Path, Distance) :-
                         'criteria': 'BFS (Any Valid Path)'
                     }
             
-            print("No path found - query returned no results")
+            print("No path found - search returned no results")
             return None
             
         except Exception as e:
@@ -406,45 +673,447 @@ safe_dijkstra([Current|Queue], End, AvoidCondition, Path, Distance) :-
             traceback.print_exc()
             return None
     
-    def _calculate_distance(self, path: List[str]) -> float:
-        """Calculate total distance for a path."""
-        total = 0
-        for i in range(len(path) - 1):
-            # Use connected predicate (matches new Prolog file)
-            query = f"connected({path[i]}, {path[i+1]}, D, _, _)"
-            results = list(self.prolog.query(query))
-            if results:
-                total += results[0]['D']
-        return total
+    def _graph(self) -> Dict[str, List[Tuple[str, float, int, int]]]:
+        """Return the adjacency list, loading it from Prolog on first use."""
+        adj = self._adj
+        if adj is None:
+            adj = self._load_graph()
+        return adj
+    
+    def _load_graph(self) -> Dict[str, List[Tuple[str, float, int, int]]]:
+        """Build the adjacency list from a single road/5 query."""
+        version = self._version
+        adj: Dict[str, List[Tuple[str, float, int, int]]] = {}
+        seen = set()
+        # Facts are stored in one direction only; add the reverse here.
+        # clause/2 also skips the recursive symmetric rule that older
+        # generated knowledge bases still contain.
+        A, B, D, T, S, L = (Variable() for _ in range(6))
+        result = self._first_solution(self._findall(
+            [A, B, D, T, S], self._clause(self._road(A, B, D, T, S), 'true'), L), L)
+        # findall/3 always succeeds, so no solution means Prolog raised;
+        # don't cache an empty graph for that
+        if result is None:
+            raise RuntimeError("could not read road/5 facts")
+        for a, b, d, t, s in result[0]:
+            a, b = str(a), str(b)
+            t = ROAD_TYPES.get(str(t), -1)
+            s = STATUSES.get(str(s), -1)
+            for u, v in ((a, b), (b, a)):
+                if (u, v, d, t, s) not in seen:
+                    seen.add((u, v, d, t, s))
+                    adj.setdefault(u, []).append((v, d, t, s))
+                    adj.setdefault(v, [])
+        self._cache_if_current(version, _adj=adj)
+        return adj
     
-    def _calculate_time(self, path: List[str]) -> float:
-        """Calculate estimated travel time in minutes."""
-        total_time = 0
-        for i in range(len(path) - 1):
-            # Try travel_time predicate
-            query = f"travel_time({path[i]}, {path[i+1]}, T)"
-            results = list(self.prolog.query(query))
-            if results:
-                total_time += results[0]['T']
+    def _road_conditions(self) -> Dict[Tuple[str, str], set]:
+        """Return the (source, dest) -> {condition} index, loading it on first use."""
+        conditions = self._conditions
+        if conditions is None:
+            version = self._version
+            conditions = {}
+            A, B, C, L = (Variable() for _ in range(4))
+            result = self._first_solution(self._findall(
+                [A, B, C], self._clause(self._road_condition(A, B, C), 'true'), L), L)
+            if result is None:
+                raise RuntimeError("could not read road_condition/3 facts")
+            for a, b, c in result[0]:
+                a, b, c = str(a), str(b), str(c)
+                conditions.setdefault((a, b), set()).add(c)
+                conditions.setdefault((b, a), set()).add(c)
+            self._cache_if_current(version, _conditions=conditions)
+        return conditions
+    
+    def _cache_if_current(self, version: int, **caches) -> bool:
+        """
+        Store freshly built search caches unless the network has changed.
+        
+        Args:
+            version: Value of _version read before the data was fetched
+            caches: Attribute names and the values to store in them
+            
+        Returns:
+            True if stored, False if an edit made the values stale
+        """
+        with self._cache_lock:
+            if self._version != version:
+                return False
+            for name, value in caches.items():
+                setattr(self, name, value)
+            return True
+    
+    @staticmethod
+    def _open_distance(a, b, distance, road_type, status):
+        """Edge weight for distance-based searches over open roads."""
+        return distance if status == OPEN else None
+    
+    @staticmethod
+    def _open_time(a, b, distance, road_type, status):
+        """Edge weight in minutes for open roads."""
+        if status != OPEN or road_type not in TYPE_SPEEDS:
+            return None
+        return distance / TYPE_SPEEDS[road_type] * 60
+    
+    @staticmethod
+    def _paved_distance(a, b, distance, road_type, status):
+        """Edge weight for open paved roads only."""
+        return distance if status == OPEN and road_type == PAVED else None
+    
+    def _weight_fn(self, weight: str, avoid: Optional[str] = None) -> Callable:
+        """
+        Return the per-edge cost function for a weighting.
+        
+        The function is called as fn(a, b, distance, type, status) and
+        returns the edge cost, or None if the edge may not be used.
+        """
+        base = {
+            'distance': self._open_distance,
+            'time': self._open_time,
+            'paved': self._paved_distance,
+        }[weight]
+        if avoid is None:
+            return base
+        
+        conditions = self._road_conditions()
+        
+        def safe(a, b, distance, road_type, status):
+            if avoid in conditions.get((a, b), ()):
+                return None
+            return base(a, b, distance, road_type, status)
+        return safe
+    
+    def _dijkstra(self, start: str, end: str, weight: str,
+                  avoid: Optional[str] = None) -> Optional[Tuple[List[str], float]]:
+        """
+        Find the cheapest path using Dijkstra's algorithm.
+        
+        Args:
+            start: Starting location
+            end: Destination
+            weight: 'distance', 'time' or 'paved' (distance over paved roads)
+            avoid: Road condition whose roads may not be used
+        
+        Returns:
+            (path, cost) or None if the destination is unreachable
+        """
+        adj = self._graph()
+        if start not in adj or end not in adj:
+            return None
+        if self._use_apsp():
+            return self._apsp_path(start, end, weight, avoid)
+        if self._use_csr():
+            return self._dijkstra_jit(start, end, weight, avoid)
+        
+        weight_fn = self._weight_fn(weight, avoid)
+        best = {start: 0}
+        previous: Dict[str, str] = {}
+        heap = [(0, start)]
+        while heap:
+            cost, node = heapq.heappop(heap)
+            if node == end:
+                return self._build_path(previous, start, end), cost
+            if cost > best[node]:
+                continue
+            for nxt, distance, road_type, status in adj[node]:
+                edge_cost = weight_fn(node, nxt, distance, road_type, status)
+                if edge_cost is None:
+                    continue
+                new_cost = cost + edge_cost
+                if new_cost < best.get(nxt, float('inf')):
+                    best[nxt] = new_cost
+                    previous[nxt] = node
+                    heapq.heappush(heap, (new_cost, nxt))
+        return None
+    
+    def _bidir_dijkstra(self, start: str, end: str, weight: str,
+                        avoid: Optional[str] = None) -> Optional[Tuple[List[str], float]]:
+        """
+        Find the cheapest path by searching from both ends at once.
+        
+        Roads are undirected, so the backward search walks the same
+        adjacency list. The search stops once the two frontier minima
+        together can no longer beat the best meeting cost found.
+        
+        Args:
+            start: Starting location
+            end: Destination
+            weight: Same as for _dijkstra
+            avoid: Same as for _dijkstra
+        
+        Returns:
+            (path, cost) or None if the destination is unreachable
+        """
+        adj = self._graph()
+        if start not in adj or end not in adj:
+            return None
+        if start == end:
+            return [start], 0
+        if self._use_apsp():
+            return self._apsp_path(start, end, weight, avoid)
+        if self._use_csr():
+            return self._dijkstra_jit(start, end, weight, avoid)
+        
+        weight_fn = self._weight_fn(weight, avoid)
+        inf = float('inf')
+        dist_f, dist_b = {start: 0}, {end: 0}
+        prev_f: Dict[str, str] = {}
+        prev_b: Dict[str, str] = {}
+        heap_f, heap_b = [(0, start)], [(0, end)]
+        mu = inf
+        meet = None
+        
+        while heap_f and heap_b:
+            if heap_f[0][0] + heap_b[0][0] >= mu:
+                break
+            forward = heap_f[0][0] <= heap_b[0][0]
+            if forward:
+                heap, dist, prev, other = heap_f, dist_f, prev_f, dist_b
             else:
-                # Fallback: calculate manually
-                query = f"connected({path[i]}, {path[i+1]}, D, Type, _)"
-                results = list(self.prolog.query(query))
-                if results:
-                    distance = results[0]['D']
-                    road_type = results[0]['Type']
-                    # Get speed for road type
-                    speed_query = f"speed({road_type}, Speed)"
-                    speed_results = list(self.prolog.query(speed_query))
-                    if speed_results:
-                        speed = speed_results[0]['Speed']
-                        total_time += (distance / speed) * 60
-        return total_time
+                heap, dist, prev, other = heap_b, dist_b, prev_b, dist_f
+            
+            cost, node = heapq.heappop(heap)
+            if cost > dist[node]:
+                continue
+            for nxt, distance, road_type, status in adj[node]:
+                if forward:
+                    edge_cost = weight_fn(node, nxt, distance, road_type, status)
+                else:
+                    edge_cost = weight_fn(nxt, node, distance, road_type, status)
+                if edge_cost is None:
+                    continue
+                new_cost = cost + edge_cost
+                if new_cost < dist.get(nxt, inf):
+                    dist[nxt] = new_cost
+                    prev[nxt] = node
+                    heapq.heappush(heap, (new_cost, nxt))
+                if nxt in other and new_cost + other[nxt] < mu:
+                    mu = new_cost + other[nxt]
+                    meet = nxt
+        
+        if meet is None:
+            return None
+        path = self._build_path(prev_f, start, meet)
+        node = meet
+        while node != end:
+            node = prev_b[node]
+            path.append(node)
+        return path, mu
+    
+    def _use_apsp(self) -> bool:
+        """Whether the network is small enough for the all-pairs table."""
+        return floyd_warshall is not None and len(self._graph()) <= APSP_THRESHOLD
+    
+    def _apsp_path(self, start: str, end: str, weight: str,
+                   avoid: Optional[str] = None) -> Optional[Tuple[List[str], float]]:
+        """
+        Look a path up in the all-pairs table for a weighting.
+        
+        The table is computed with Floyd-Warshall on first use and kept
+        until the network changes.
+        """
+        key = (weight, avoid)
+        table = self._apsp.get(key)
+        if table is None:
+            version = self._version
+            indptr, dst_idx = self._csr_graph()[:2]
+            weights = self._csr_weights(weight, avoid)
+            n = len(indptr) - 1
+            src_idx = np.repeat(np.arange(n), np.diff(indptr))
+            # Parallel roads between two places keep the cheapest one
+            dense = np.full((n, n), np.inf)
+            np.minimum.at(dense, (src_idx, dst_idx), weights)
+            graph = csgraph_from_dense(dense, null_value=np.inf)
+            table = floyd_warshall(graph, directed=True, return_predecessors=True)
+            with self._cache_lock:
+                if self._version == version:
+                    self._apsp[key] = table
+        
+        dist, predecessors = table
+        node_id = self._node_ids()
+        src, dst = node_id[start], node_id[end]
+        if dist[src, dst] == np.inf:
+            return None
+        
+        names = list(node_id)
+        path = [dst]
+        while path[-1] != src:
+            path.append(predecessors[src, path[-1]])
+        return [names[i] for i in reversed(path)], float(dist[src, dst])
+    
+    def _use_csr(self) -> bool:
+        """Whether the network is large enough for the compiled search."""
+        return njit is not None and len(self._graph()) > CSR_THRESHOLD
+    
+    def _csr_graph(self) -> tuple:
+        """
+        Return the adjacency list as CSR arrays, building them if stale.
+        
+        Edges are stored as parallel columns so a search only touches the
+        data its weighting needs:
+            (indptr, dst_idx, dist, type_code, status_code)
+        """
+        return self._csr_state()[1]
+    
+    def _node_ids(self) -> Dict[str, int]:
+        """Return the location -> CSR row index matching _csr_graph()."""
+        return self._csr_state()[0]
+    
+    def _csr_state(self) -> tuple:
+        """Return (node_id, CSR arrays), kept together so they always match."""
+        state = self._csr
+        if state is None:
+            version = self._version
+            adj = self._graph()
+            node_id = {name: i for i, name in enumerate(adj)}
+            n_edges = sum(len(neighbours) for neighbours in adj.values())
+            indptr = np.zeros(len(adj) + 1, dtype=np.int64)
+            dst_idx = np.empty(n_edges, dtype=np.int64)
+            dist = np.empty(n_edges)
+            type_code = np.empty(n_edges, dtype=np.int8)
+            status_code = np.empty(n_edges, dtype=np.int8)
+            k = 0
+            for i, neighbours in enumerate(adj.values()):
+                for nxt, distance, road_type, status in neighbours:
+                    dst_idx[k] = node_id[nxt]
+                    dist[k] = distance
+                    type_code[k] = road_type
+                    status_code[k] = status
+                    k += 1
+                indptr[i + 1] = k
+            state = (node_id, (indptr, dst_idx, dist, type_code, status_code))
+            self._cache_if_current(version, _csr=state)
+        return state
+    
+    def _csr_weights(self, weight: str, avoid: Optional[str] = None):
+        """Vectorized counterpart of _weight_fn; unusable edges cost inf."""
+        indptr, dst_idx, dist, type_code, status_code = self._csr_graph()
+        usable = status_code == OPEN
+        if weight == 'time':
+            usable &= type_code >= 0
+            speeds = np.array([TYPE_SPEEDS[code] for code in range(len(TYPE_SPEEDS))],
+                              dtype=float)
+            cost = dist / speeds[np.maximum(type_code, 0)] * 60
+        else:
+            if weight == 'paved':
+                usable &= type_code == PAVED
+            cost = dist
+        
+        if avoid is not None:
+            node_id = self._node_ids()
+            for (a, b), conditions in self._road_conditions().items():
+                if avoid in conditions and a in node_id and b in node_id:
+                    row = node_id[a]
+                    lo, hi = indptr[row], indptr[row + 1]
+                    usable[lo:hi] &= dst_idx[lo:hi] != node_id[b]
+        return np.where(usable, cost, np.inf)
+    
+    def _dijkstra_jit(self, start: str, end: str, weight: str,
+                      avoid: Optional[str] = None) -> Optional[Tuple[List[str], float]]:
+        """Run _dijkstra_csr for a weighting on the CSR arrays."""
+        indptr, dst_idx = self._csr_graph()[:2]
+        weights = self._csr_weights(weight, avoid)
+        
+        node_id = self._node_ids()
+        src, dst = node_id[start], node_id[end]
+        cost, prev = _dijkstra_csr(indptr, dst_idx, weights, src, dst)
+        if cost == np.inf:
+            return None
+        
+        names = list(node_id)
+        path = [dst]
+        while path[-1] != src:
+            path.append(prev[path[-1]])
+        return [names[i] for i in reversed(path)], float(cost)
+    
+    def _bfs(self, start: str, end: str) -> Optional[List[str]]:
+        """Find the path with the fewest segments over open roads."""
+        adj = self._graph()
+        if start not in adj or end not in adj:
+            return None
+        
+        previous: Dict[str, str] = {}
+        visited = {start}
+        queue = deque([start])
+        while queue:
+            node = queue.popleft()
+            if node == end:
+                return self._build_path(previous, start, end)
+            for nxt, _, _, status in adj[node]:
+                if status == OPEN and nxt not in visited:
+                    visited.add(nxt)
+                    previous[nxt] = node
+                    queue.append(nxt)
+        return None
+    
+    @staticmethod
+    def _build_path(previous: Dict[str, str], start: str, end: str) -> List[str]:
+        """Walk predecessor links back from end to start."""
+        path = [end]
+        while path[-1] != start:
+            path.append(previous[path[-1]])
+        path.reverse()
+        return path
+    
+    def _path_totals(self, path: List[str], weight: str,
+                     avoid: Optional[str] = None) -> Tuple[float, float]:
+        """
+        Total the distance and travel time along a found path.
+        
+        Several roads may join the same two places, so each hop counts
+        the road the search itself would take: the cheapest usable one
+        under the same weighting, with ties going to the quicker road.
+        
+        Args:
+            path: Locations from start to end
+            weight: Weighting the path was searched with
+            avoid: Road condition the search avoided, if any
+            
+        Returns:
+            Tuple of (distance in km, time in minutes)
+        """
+        adj = self._graph()
+        cost = self._weight_fn(weight, avoid)
+        total_distance = total_time = 0
+        for a, b in zip(path, path[1:]):
+            best = None
+            for v, distance, road_type, status in adj[a]:
+                if v != b:
+                    continue
+                edge_cost = cost(a, b, distance, road_type, status)
+                if edge_cost is None:
+                    continue
+                speed = TYPE_SPEEDS.get(road_type)
+                time = distance / speed * 60 if speed else float('inf')
+                if best is None or (edge_cost, time) < best[:2]:
+                    best = (edge_cost, time, distance)
+            total_distance += best[2]
+            total_time += best[1]
+        return total_distance, total_time
+    
+    def _invalidate_caches(self):
+        """Drop cached query results after the network has changed."""
+        with self._cache_lock:
+            self._version += 1
+            self._path_cache = {}
+            self._adj = None
+            self._conditions = None
+            self._csr = None
+            self._apsp = {}
     
     def _append_to_file(self, content: str):
-        """Append content to the Prolog file."""
+        """Queue content to be appended to the Prolog file."""
+        self._pending_writes.append(content)
+        if len(self._pending_writes) >= self._flush_threshold:
+            self._flush_writes()
+    
+    def _flush_writes(self):
+        """Write all queued content to the Prolog file in one go."""
+        if not self._pending_writes:
+            return
         with open(self.prolog_file, 'a') as f:
-            f.write(content)
+            f.writelines(self._pending_writes)
+        self._pending_writes.clear()
 
 
 class RoadNetworkGUI:
@@ -453,6 +1122,15 @@ class RoadNetworkGUI:
     Provides user and administrator interfaces.
     """
     
+    # Lowercases ASCII names and turns spaces into underscores in one pass
+    _NORM_TABLE = str.maketrans(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZ ",
+        "abcdefghijklmnopqrstuvwxyz_"
+    )
+    
+    # Options shared by every action button
+    _BTN_KW = {'style': 'Custom.TButton'}
+    
     def __init__(self, root):
         """Initialize the GUI application."""
         self.root = root
@@ -468,13 +1146,32 @@ class RoadNetworkGUI:
             self.root.destroy()
             return
         
+        # Set while a background location refresh is in flight
+        self._refresh_pending = False
+        self._refresh_again = False
+        # Message a handler wants shown once the refresh lands, if any
+        self._refresh_status: Optional[str] = None
+        # Locations currently shown in the comboboxes
+        self._last_locations: tuple = ()
+        # (start, dest, criteria, network version) -> find_path result
+        self._path_cache: Dict[tuple, Dict] = {}
+        # Searches run here so the Tk thread keeps drawing
+        self._executor = self._new_executor()
+        self._locations_version = -1
+        # Rendered network info and the network version it was built from
+        self._info_cache: Optional[str] = None
+        self._cache_version = -1
+        # Generator currently streaming into the info pane, if any
+        self._info_stream = None
+        
         # Setup the GUI
         self.setup_styles()
         self.create_widgets()
         
     def setup_styles(self):
         """Configure ttk styles for consistent appearance."""
-        style = ttk.Style()
+        # Created once and kept; every tab's widgets resolve against it
+        self._style = style = ttk.Style(self.root)
         style.theme_use('clam')
         
         style.configure('Title.TLabel', 
@@ -592,19 +1289,19 @@ class RoadNetworkGUI:
                 value=value
             ).pack(anchor=tk.W, pady=2)
         
-        find_btn = ttk.Button(
+        self.find_btn = ttk.Button(
             left_frame,
             text="🔍 Find Path",
             command=self.find_path,
-            style='Custom.TButton'
+            **self._BTN_KW
         )
-        find_btn.grid(row=3, column=0, columnspan=2, pady=20)
+        self.find_btn.grid(row=3, column=0, columnspan=2, pady=20)
         
         refresh_btn = ttk.Button(
             left_frame,
             text="🔄 Refresh Locations",
             command=self.refresh_locations,
-            style='Custom.TButton'
+            **self._BTN_KW
         )
         refresh_btn.grid(row=4, column=0, columnspan=2, pady=5)
         
@@ -623,7 +1320,8 @@ class RoadNetworkGUI:
             height=30,
             font=('Courier', 10),
             bg='#ecf0f1',
-            fg='#2c3e50'
+            fg='#2c3e50',
+            state='disabled'
         )
         self.results_text.pack(fill=tk.BOTH, expand=True)
         
@@ -688,7 +1386,7 @@ class RoadNetworkGUI:
             frame,
             text="➕ Add Road",
             command=self.add_road,
-            style='Custom.TButton'
+            **self._BTN_KW
         )
         add_btn.grid(row=5, column=0, columnspan=2, pady=20)
         
@@ -724,7 +1422,7 @@ class RoadNetworkGUI:
             frame,
             text="🔄 Update Status",
             command=self.update_road_status,
-            style='Custom.TButton'
+            **self._BTN_KW
         )
         update_btn.grid(row=3, column=0, columnspan=2, pady=20)
         
@@ -762,7 +1460,7 @@ class RoadNetworkGUI:
             frame,
             text="⚠️ Add Condition",
             command=self.add_condition,
-            style='Custom.TButton'
+            **self._BTN_KW
         )
         add_btn.grid(row=3, column=0, columnspan=2, pady=20)
         
@@ -781,7 +1479,8 @@ class RoadNetworkGUI:
             height=30,
             font=('Courier', 10),
             bg='#ecf0f1',
-            fg='#2c3e50'
+            fg='#2c3e50',
+            state='disabled'
         )
         self.info_text.pack(fill=tk.BOTH, expand=True)
         
@@ -789,23 +1488,86 @@ class RoadNetworkGUI:
             info_frame,
             text="🔄 Refresh Information",
             command=self.display_network_info,
-            style='Custom.TButton'
+            **self._BTN_KW
         )
         refresh_btn.pack(pady=10)
         
-        self.display_network_info()
+        # Filled in the first time the tab is opened rather than at startup
+        self._info_tab = tab
+        self._info_loaded = False
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+        
+    def _on_tab_changed(self, event):
+        """Build the network info the first time its tab is selected."""
+        if not self._info_loaded and self.notebook.select() == str(self._info_tab):
+            self._info_loaded = True
+            self.display_network_info()
         
-    def refresh_locations(self):
-        """Refresh the list of available locations."""
+    def refresh_locations(self, status: Optional[str] = None):
+        """
+        Refresh the list of available locations without blocking the UI.
+        
+        Args:
+            status: Message to show once the locations are loaded, in place
+                of the location count
+        """
+        if status is not None:
+            self._refresh_status = status
+        if self._refresh_pending:
+            # Coalesce into one more fetch once the current one lands
+            self._refresh_again = True
+            return
+        if self._locations_version == self.network._version:
+            self._show_loaded(len(self._last_locations))
+            return
+        self._refresh_pending = True
+        self.status_var.set("Loading locations...")
+        threading.Thread(target=self._bg_refresh, daemon=True).start()
+        
+    def _bg_refresh(self):
+        """Fetch locations on a worker thread and hand them to the Tk thread."""
+        version = self.network._version
         locations = self.network.get_all_locations()
-        self.start_combo['values'] = locations
-        self.dest_combo['values'] = locations
+        self.root.after(0, lambda locs=locations: self._apply_locations(locs, version))
+        
+    def _apply_locations(self, locations: Optional[List[str]], version: int):
+        """Show fetched locations in the comboboxes."""
+        self._refresh_pending = False
+        # A queued refresh sets the status itself when it lands
+        requeued = self._refresh_again
+        if requeued:
+            self._refresh_again = False
+            self.root.after_idle(self.refresh_locations)
+        if locations is None:
+            # Keep the last good list and leave the version unrecorded so
+            # Refresh Locations queries again
+            if not requeued:
+                self._refresh_status = None
+                self.status_var.set("Error loading locations")
+            return
+        self._locations_version = version
+        new = tuple(locations)
+        if new == self._last_locations:
+            # Same list as before; leave Tk's widgets and selections alone
+            if not requeued:
+                self._show_loaded(len(locations))
+            return
+        self._last_locations = new
+        # Both comboboxes share the one tuple
+        self.start_combo['values'] = new
+        self.dest_combo['values'] = new
         
         if locations:
             self.start_combo.current(0)
             self.dest_combo.current(min(1, len(locations) - 1))
         
-        self.status_var.set(f"Loaded {len(locations)} locations")
+        if not requeued:
+            self._show_loaded(len(locations))
+        
+    def _show_loaded(self, count: int):
+        """Show the pending handler message, or the location count."""
+        self.status_var.set(self._refresh_status or f"Loaded {count} locations")
+        self._refresh_status = None
         
     def find_path(self):
         """Execute pathfinding based on user input."""
@@ -821,60 +1583,117 @@ class RoadNetworkGUI:
             messagebox.showwarning("Invalid Input", "Start and destination must be different")
             return
         
-        self.status_var.set(f"Finding path from {start} to {dest}...")
-        self.results_text.delete(1.0, tk.END)
+        key = (start, dest, criteria, self.network._version)
+        if key in self._path_cache:
+            # Move the hit to the back so it is dropped last
+            result = self._path_cache.pop(key)
+            self._path_cache[key] = result
+            self._render_path_result(start, dest, result)
+            return
         
-        result = self.network.find_path(start, dest, criteria)
+        self.status_var.set(f"Finding path from {start} to {dest}...")
+        self.find_btn.configure(state='disabled')
         
+        try:
+            future = self._executor.submit(self.network.find_path, start, dest, criteria)
+        except concurrent.futures.thread.BrokenThreadPool:
+            # The worker's engine attach failed earlier; start a fresh one
+            self._executor = self._new_executor()
+            future = self._executor.submit(self.network.find_path, start, dest, criteria)
+        
+        def done(f):
+            if f.exception() is not None:
+                self.root.after(0, self._search_failed, f.exception())
+            else:
+                self.root.after(0, self._finish_search, key, f.result())
+        
+        future.add_done_callback(done)
+        
+    def _new_executor(self) -> concurrent.futures.ThreadPoolExecutor:
+        """Create the single search worker, attached to Prolog on start."""
+        return concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, initializer=self.network.attach_thread)
+        
+    def _search_failed(self, error: BaseException):
+        """Report a search that could not run and re-enable the Find button."""
+        if isinstance(error, concurrent.futures.thread.BrokenThreadPool):
+            self._executor = self._new_executor()
+        self.find_btn.configure(state='normal')
+        self.status_var.set("Path search failed")
+        messagebox.showerror("Error", f"Path search failed: {error}")
+        
+    def _finish_search(self, key: tuple, result: Optional[Dict]):
+        """Remember a completed search and show it."""
+        # The backend returns None both for no route and for a failed query,
+        # so only found paths are kept and a miss is searched again next time
+        if result is not None:
+            self._path_cache[key] = result
+            if len(self._path_cache) > PATH_CACHE_SIZE:
+                self._path_cache.pop(next(iter(self._path_cache)))
+        self._render_path_result(key[0], key[1], result)
+        
+    def _render_path_result(self, start: str, dest: str, result: Optional[Dict]):
+        """Show a finished search in the results pane."""
+        self.find_btn.configure(state='normal')
+        
+        parts = []
+        add = parts.append
         if result:
-            output = "="*60 + "\n"
-            output += "PATH FOUND! ✓\n"
-            output += "="*60 + "\n\n"
-            output += f"Criteria: {result['criteria']}\n"
-            output += f"From: {start}\n"
-            output += f"To: {dest}\n\n"
-            output += "-"*60 + "\n"
-            output += "ROUTE:\n"
-            output += "-"*60 + "\n"
+            add(_EQ60)
+            add("PATH FOUND! ✓\n")
+            add(_EQ60_GAP)
+            add(f"Criteria: {result['criteria']}\n")
+            add(f"From: {start}\n")
+            add(f"To: {dest}\n\n")
+            add(_DASH60)
+            add("ROUTE:\n")
+            add(_DASH60)
             
             path_str = " → ".join(result['path'])
-            output += f"\n{path_str}\n\n"
+            add(f"\n{path_str}\n\n")
             
-            output += "-"*60 + "\n"
-            output += "SUMMARY:\n"
-            output += "-"*60 + "\n"
-            output += f"📏 Total Distance: {result['distance']:.2f} km\n"
-            output += f"⏱️  Estimated Time: {result['time']:.2f} minutes\n"
-            output += f"                  ({result['time']/60:.2f} hours)\n"
-            output += f"🛣️  Number of Segments: {len(result['path']) - 1}\n"
-            output += "="*60 + "\n"
+            add(_DASH60)
+            add("SUMMARY:\n")
+            add(_DASH60)
+            add(
+                f"📏 Total Distance: {result['distance']:.2f} km\n"
+                f"⏱️  Estimated Time: {result['time']:.2f} minutes\n"
+                f"                  ({result['time']/60:.2f} hours)\n"
+                f"🛣️  Number of Segments: {len(result['path']) - 1}\n"
+            )
+            add(_EQ60)
             
             self.status_var.set("Path found successfully!")
         else:
-            output = "="*60 + "\n"
-            output += "NO PATH FOUND ✗\n"
-            output += "="*60 + "\n\n"
-            output += f"Could not find a route from {start} to {dest}\n"
-            output += "with the specified criteria.\n\n"
-            output += "Possible reasons:\n"
-            output += "• No connecting roads exist\n"
-            output += "• All routes are blocked/closed\n"
-            output += "• Criteria too restrictive\n"
-            output += "="*60 + "\n"
+            add(_EQ60)
+            add("NO PATH FOUND ✗\n")
+            add(_EQ60_GAP)
+            add(f"Could not find a route from {start} to {dest}\n")
+            add("with the specified criteria.\n\n")
+            add("Possible reasons:\n")
+            add("• No connecting roads exist\n")
+            add("• All routes are blocked/closed\n")
+            add("• Criteria too restrictive\n")
+            add(_EQ60)
             
             self.status_var.set("No path found")
         
-        self.results_text.insert(1.0, output)
+        self._show_text(self.results_text, "".join(parts))
+        
+    @staticmethod
+    def _norm(entry) -> str:
+        """Read an entry as a location name: trimmed, lowercase, underscores for spaces."""
+        return entry.get().strip().translate(RoadNetworkGUI._NORM_TABLE)
         
     def add_road(self):
         """Add a new road to the network."""
-        source = self.add_source_entry.get().strip().lower().replace(" ", "_")
-        dest = self.add_dest_entry.get().strip().lower().replace(" ", "_")
+        source = self._norm(self.add_source_entry)
+        dest = self._norm(self.add_dest_entry)
         distance_str = self.add_distance_entry.get().strip()
         road_type = self.add_type_var.get()
         status = self.add_status_var.get()
         
-        if not all([source, dest, distance_str]):
+        if not source or not dest or not distance_str:
             messagebox.showwarning("Input Required", "Please fill in all fields")
             return
         
@@ -893,18 +1712,17 @@ class RoadNetworkGUI:
             self.add_source_entry.delete(0, tk.END)
             self.add_dest_entry.delete(0, tk.END)
             self.add_distance_entry.delete(0, tk.END)
-            self.refresh_locations()
-            self.status_var.set("Road added successfully")
+            self.refresh_locations(status="Road added successfully")
         else:
             messagebox.showerror("Error", "Failed to add road")
             
     def update_road_status(self):
         """Update the status of a road."""
-        source = self.update_source_entry.get().strip().lower().replace(" ", "_")
-        dest = self.update_dest_entry.get().strip().lower().replace(" ", "_")
+        source = self._norm(self.update_source_entry)
+        dest = self._norm(self.update_dest_entry)
         new_status = self.update_status_var.get()
         
-        if not all([source, dest]):
+        if not source or not dest:
             messagebox.showwarning("Input Required", "Please fill in all fields")
             return
         
@@ -920,11 +1738,11 @@ class RoadNetworkGUI:
             
     def add_condition(self):
         """Add a road condition."""
-        source = self.cond_source_entry.get().strip().lower().replace(" ", "_")
-        dest = self.cond_dest_entry.get().strip().lower().replace(" ", "_")
+        source = self._norm(self.cond_source_entry)
+        dest = self._norm(self.cond_dest_entry)
         condition = self.cond_type_var.get()
         
-        if not all([source, dest]):
+        if not source or not dest:
             messagebox.showwarning("Input Required", "Please fill in all fields")
             return
         
@@ -940,62 +1758,143 @@ class RoadNetworkGUI:
             
     def display_network_info(self):
         """Display network statistics and information."""
-        self.info_text.delete(1.0, tk.END)
+        info_text = self.info_text
+        status_var = self.status_var
+        version = self.network._version
+        if self._cache_version == version and self._info_cache:
+            self._show_text(info_text, self._info_cache)
+            status_var.set("Network information refreshed")
+            return
         
-        locations = self.network.get_all_locations()
+        self._show_text(info_text, "")
+        status_var.set("Loading network information...")
+        chunks = self._info_chunks()
+        self._info_stream = chunks
+        rendered = []
+        append_text = self._append_text
+        after = self.root.after
+        
+        def pump():
+            # A newer refresh has taken over the pane
+            if self._info_stream is not chunks:
+                return
+            try:
+                chunk = next(chunks)
+            except StopIteration as done:
+                self._info_stream = None
+                # Don't cache a failed read; the next refresh tries again
+                if done.value:
+                    self._info_cache = "".join(rendered)
+                    self._cache_version = version
+                status_var.set("Network information refreshed")
+                return
+            rendered.append(chunk)
+            append_text(info_text, chunk)
+            after(0, pump)
+        
+        pump()
+        
+    def _info_chunks(self):
+        """
+        Generate the network information text a batch of lines at a time.
         
-        output = "="*70 + "\n"
-        output += "JAMAICAN RURAL ROAD NETWORK - NETWORK INFORMATION\n"
-        output += "="*70 + "\n\n"
+        Returns:
+            True when the generator finishes after successful location and
+            road queries, False if either could not be read
+        """
+        network = self.network
+        locations = network.get_all_locations()
+        locations_ok = locations is not None
+        if not locations_ok:
+            locations = []
         
-        output += f"📍 Total Locations: {len(locations)}\n"
-        output += "-"*70 + "\n"
+        parts = []
+        parts.append(_EQ70)
+        parts.append("JAMAICAN RURAL ROAD NETWORK - NETWORK INFORMATION\n")
+        parts.append(_EQ70_GAP)
         
-        for i, loc in enumerate(locations, 1):
-            output += f"  {i:2d}. {loc}\n"
+        parts.append(f"📍 Total Locations: {len(locations)}\n")
+        parts.append(_DASH70)
+        yield "".join(parts)
         
-        output += "\n"
+        lines = [f"  {i:2d}. {loc}\n" for i, loc in enumerate(locations, 1)]
+        for i in range(0, len(lines), INFO_BATCH):
+            yield "".join(lines[i:i + INFO_BATCH])
         
         try:
-            roads = list(self.network.prolog.query("road(A, B, D, T, S)"))
+            # Each row keeps the stored A, B for display, which is the order
+            # Update Status matches on, plus the canon/4 pair X, Y as the
+            # dedup key
+            roads = network.get_road_listing()
+            total = n_open = n_closed = n_paved = n_unpaved = 0
             unique_roads = set()
-            for r in roads:
-                road_tuple = tuple(sorted([r['A'], r['B']]))
-                unique_roads.add(road_tuple)
-            
-            open_roads = [r for r in roads if r['S'] == 'open']
-            closed_roads = [r for r in roads if r['S'] == 'closed']
-            paved_roads = [r for r in roads if r['T'] == 'paved']
-            unpaved_roads = [r for r in roads if r['T'] == 'unpaved']
-            
-            output += f"🛣️  Road Statistics:\n"
-            output += "-"*70 + "\n"
-            output += f"  Total Unique Roads: {len(unique_roads)}\n"
-            output += f"  Total Directional Segments: {len(roads)}\n"
-            output += f"  Open Roads: {len(open_roads)}\n"
-            output += f"  Closed Roads: {len(closed_roads)}\n"
-            output += f"  Paved Roads: {len(paved_roads)}\n"
-            output += f"  Unpaved Roads: {len(unpaved_roads)}\n\n"
-            
-            output += "📋 All Roads:\n"
-            output += "-"*70 + "\n"
-            displayed_roads = set()
-            for r in roads:
-                road_key = tuple(sorted([r['A'], r['B']]))
-                if road_key not in displayed_roads:
-                    status_icon = "✓" if r['S'] == 'open' else "✗"
-                    type_icon = "🛣️" if r['T'] == 'paved' else "🏞️"
-                    output += f"  {status_icon} {type_icon} {r['A']} ↔ {r['B']}: "
-                    output += f"{r['D']} km ({r['T']}, {r['S']})\n"
-                    displayed_roads.add(road_key)
-            
+            road_lines = []
+            add_key = unique_roads.add
+            add_line = road_lines.append
+            status_icons, type_icons = _STATUS_ICON.get, _TYPE_ICON.get
+            # One pass gathers the counts and the display lines together
+            for a, b, x, y, d, t, s in roads:
+                total += 1
+                a, b, t, s = str(a), str(b), str(t), str(s)
+                road_key = (str(x), str(y))
+                if s == 'open':
+                    n_open += 1
+                elif s == 'closed':
+                    n_closed += 1
+                if t == 'paved':
+                    n_paved += 1
+                elif t == 'unpaved':
+                    n_unpaved += 1
+                if road_key not in unique_roads:
+                    add_key(road_key)
+                    status_icon = status_icons(s, "✗")
+                    type_icon = type_icons(t, "🏞️")
+                    add_line(
+                        f"  {status_icon} {type_icon} {a} ↔ {b}: "
+                        f"{d} km ({t}, {s})\n"
+                    )
         except Exception as e:
-            output += f"\nError retrieving road information: {e}\n"
-        
-        output += "\n" + "="*70 + "\n"
-        
-        self.info_text.insert(1.0, output)
-        self.status_var.set("Network information refreshed")
+            yield f"\n\nError retrieving road information: {e}\n"
+            yield _EQ70_END
+            return False
+        # Only the formatted lines are needed while the text streams out
+        del roads
+        
+        parts = []
+        parts.append("\n")
+        parts.append(f"🛣️  Road Statistics:\n")
+        parts.append(_DASH70)
+        parts.append(f"  Total Unique Roads: {len(unique_roads)}\n")
+        parts.append(f"  Total Directional Segments: {total}\n")
+        parts.append(f"  Open Roads: {n_open}\n")
+        parts.append(f"  Closed Roads: {n_closed}\n")
+        parts.append(f"  Paved Roads: {n_paved}\n")
+        parts.append(f"  Unpaved Roads: {n_unpaved}\n\n")
+        
+        parts.append("📋 All Roads:\n")
+        parts.append(_DASH70)
+        yield "".join(parts)
+        
+        for i in range(0, len(road_lines), INFO_BATCH):
+            yield "".join(road_lines[i:i + INFO_BATCH])
+        
+        yield _EQ70_END
+        return locations_ok
+        
+    @staticmethod
+    def _append_text(widget, text: str):
+        """Add text to the end of a read-only text pane."""
+        widget.configure(state='normal')
+        widget.insert(tk.END, text)
+        widget.configure(state='disabled')
+        
+    @staticmethod
+    def _show_text(widget, text: str):
+        """Replace the contents of a read-only text pane in a single edit."""
+        widget.configure(state='normal')
+        widget.delete(1.0, tk.END)
+        widget.insert(1.0, text)
+        widget.configure(state='disabled')
 
 
 def main():